@@ -18,8 +18,25 @@ Behavior
 --------
 - Copies the XML <entry> from src, adds it to dst, then deletes from src.
 - Logs each move to moves_YYYYmmdd_HHMMSS.csv with fields:
-    timestamp,object_name,object_type,src_scope,dst_scope,status,message,summary,xml
+    timestamp,row,object_name,object_type,src_scope,dst_scope,status,message,summary,xml_b64
+  where 'row' is the 1-based data row number in objects.csv and 'xml_b64' is the
+  base64-encoded (UTF-8) <entry> XML.
 - On name collision at destination, it will SKIP (configurable).
+- Rows that share an object name or a (src, dst, type) key form one dependent group;
+  independent groups are moved concurrently (MOVE_CONCURRENCY workers, default 8).
+  Within a group, rows are sorted by (src_scope, dst_scope, object_type), unless an
+  object name repeats. Those groups keep CSV order, so chained moves (X A->B, then
+  X B->C) run as written.
+- Rows are processed in batches (MOVE_BATCH_SIZE, default 50): one bulk 'get' per
+  source container, then all set/delete edits in a single multi-config request.
+  If a batch's multi-config fails, its rows are retried one at a time.
+- Destination collisions are checked against an in-memory index of each container's
+  entry names, fetched once per (scope, type) and updated as objects move.
+- With MOVE_INDEX_CACHE=1 that index is saved under ~/.cache/panw_move/, keyed by
+  Panorama IP and config version ('show config version'), and reused by later runs
+  against the same version instead of re-fetching each container. The cache is used
+  only when the candidate config has no pending changes, and only listings fetched
+  before this run's own edits are saved.
 
 Supported object types
 ----------------------
@@ -27,27 +44,100 @@ address, address-group, service, service-group
 
 Notes
 -----
-- Moving address-groups (especially dynamic or with members) across scopes can break references
-  if member objects are not available in the destination scope. The script warns but proceeds.
+- Address-group and service-group rows are moved after every other row has finished, one at a
+  time in CSV order, so members listed in the same CSV (including nested groups listed earlier)
+  are already in place. Members not in the CSV must exist in the destination scope beforehand;
+  the script warns but proceeds.
 - This script does not run a commit. Commit separately once you’re satisfied.
 """
 
+import base64
 import csv
 import datetime as dt
-import xml.etree.ElementTree as ET
+import functools
+import glob
+import io
+import queue
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+try:
+    # C-backed libxml2 parser; same API as ElementTree for everything used here.
+    import lxml.etree as ET
+except ImportError:
+    import xml.etree.ElementTree as ET
 import requests
+from requests.adapters import HTTPAdapter
 import os
+import pickle
+import re
 import sys
-from typing import Optional
+from typing import Dict, List, Optional, Set, Tuple
+from xml.sax.saxutils import quoteattr
+
+try:
+    # HTTP/2 needs both httpx and its h2 extra.
+    import httpx
+    import h2  # noqa: F401
+except ImportError:
+    httpx = None
 
 requests.packages.urllib3.disable_warnings()
 
+# One shared client for every API call, reused by all worker threads.
+if httpx is not None:
+    # HTTP/2 multiplexes concurrent requests as streams over a single TLS connection.
+    CLIENT = httpx.Client(http2=True, verify=False, timeout=60,
+                          limits=httpx.Limits(max_connections=8, max_keepalive_connections=8))
+else:
+    # requests speaks HTTP/1.1 only; urllib3 keeps the TCP sockets alive and resumes the
+    # TLS session instead of handshaking again for each request.
+    CLIENT = requests.Session()
+    CLIENT.verify = False
+    CLIENT.headers["Connection"] = "keep-alive"
+    CLIENT.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+# Both clients already ask for gzip/deflate and decode it transparently. Whether Panorama
+# actually compresses is reported once per run by report_compression().
+COMPRESSION_REPORTED = threading.Lock()  # acquired once, never released
+
 SUPPORTED_TYPES = {
     "address": "address",
     "address-group": "address-group",
     "service": "service",
     "service-group": "service-group",
 }
+# Types whose entries reference other objects; these rows move after all others (see main()).
+GROUP_TYPES = ("address-group", "service-group")
+
+# (scope, obj_type) -> set of entry names currently in that container.
+# Filled lazily by load_scope_index() and kept in sync as objects are moved.
+# Worker threads share it, so reads-then-writes go through INDEX_LOCK.
+SCOPE_INDEX: Dict[Tuple[str, str], Set[str]] = {}
+INDEX_LOCK = threading.Lock()
+# Listings are fetched outside INDEX_LOCK, one at a time per key (FETCH_LOCKS). While a key's
+# listing is in flight, names removed from that container are parked in PENDING_DISCARDS
+# and subtracted once the listing lands, so it can't reintroduce a name deleted meanwhile.
+FETCH_LOCKS: Dict[Tuple[str, str], threading.Lock] = {}
+PENDING_DISCARDS: Dict[Tuple[str, str], Set[str]] = {}
+
+# Container listings as they were before this run sent any edit. Only these are safe to save
+# to the on-disk cache, which is keyed by the committed config version. EDITS_SENT is set
+# (under INDEX_LOCK) just before the first multi-config request goes out.
+PRISTINE_INDEX: Dict[Tuple[str, str], frozenset] = {}
+EDITS_SENT = threading.Event()
+
+# Where MOVE_INDEX_CACHE=1 keeps SCOPE_INDEX between runs, one file per Panorama config version.
+INDEX_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "panw_move")
+
+# Log rows written between explicit flushes of the CSV log.
+LOG_FLUSH_EVERY = 100
+
+# Expected CSV header columns (any order; extra columns are ignored).
+CSV_COLUMNS = ("object_name", "object_type", "src_scope", "dst_scope")
+
+# One input CSV row; 'row' is its 1-based data row number in the input file.
+Row = namedtuple("Row", "row object_name object_type src_scope dst_scope")
 
 # --- Config / IO --------------------------------------------------------------
 
@@ -58,47 +148,91 @@ def read_config(cfg_file="panw.cfg"):
             line = line.strip()
             if not line or line.startswith("#"):  # allow comments/blank lines
                 continue
-            if "=" in line:
-                k, v = line.split("=", 1)
-                cfg[k.strip()] = v.strip()
+            k, sep, v = line.partition("=")
+            if not sep:
+                continue
+            cfg[k.strip()] = v.strip()
     for k in ("panorama_ip", "api_key"):
         if k not in cfg:
             raise ValueError(f"Missing '{k}' in {cfg_file}")
     return cfg
 
-def open_logger():
+def open_logger(buffer_size=1 << 20):
     ts = dt.datetime.now().strftime("%Y%m%d_%H%M%S")
     fname = f"moves_{ts}.csv"
-    f = open(fname, "w", newline="", encoding="utf-8")
+    # Large explicit buffer so csv.writer's per-row write() calls don't each hit the disk;
+    # drain_log_queue() flushes every LOG_FLUSH_EVERY rows.
+    buf = io.BufferedWriter(io.FileIO(fname, "w"), buffer_size=buffer_size)
+    f = io.TextIOWrapper(buf, encoding="utf-8", newline="", write_through=False)
     w = csv.writer(f)
-    w.writerow(["timestamp","object_name","object_type","src_scope","dst_scope","status","message","summary","xml"])
+    w.writerow(["timestamp","row","object_name","object_type","src_scope","dst_scope","status","message","summary","xml_b64"])
     return f, w, fname
 
+def drain_log_queue(log_q, writer, log_f):
+    """
+    Write queued log rows until the None sentinel arrives, flushing every LOG_FLUSH_EVERY rows.
+    Rows are timestamped here rather than by the workers; the formatted stamp is reused
+    until the second changes.
+    """
+    written = 0
+    last_sec, stamp = None, ""
+    while True:
+        row = log_q.get()
+        if row is None:
+            log_f.flush()
+            return
+        sec = int(time.time())
+        if sec != last_sec:
+            last_sec, stamp = sec, time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(sec))
+        writer.writerow([stamp] + row)
+        written += 1
+        if written % LOG_FLUSH_EVERY == 0:
+            log_f.flush()
+
 # --- Panorama API helpers -----------------------------------------------------
 
-def api_get_config(pan_ip, api_key, xpath):
+# The API key is carried on CLIENT.params (set once in main), so the helpers only
+# pass the per-call parameters.
+
+def api_get_config(pan_ip, xpath):
     url = f"https://{pan_ip}/api/"
-    params = {"type": "config", "action": "get", "key": api_key, "xpath": xpath}
-    r = requests.get(url, params=params, verify=False, timeout=60)
+    params = {"type": "config", "action": "get", "xpath": xpath}
+    r = CLIENT.get(url, params=params, timeout=60)
     r.raise_for_status()
+    report_compression(r)
     return r.text
 
-def api_set_config(pan_ip, api_key, xpath, element_xml):
+def report_compression(r):
+    """Print once whether Panorama compressed a non-trivial (>= 1 KiB) config response."""
+    if len(r.content) < 1024 or not COMPRESSION_REPORTED.acquire(blocking=False):
+        return
+    enc = r.headers.get("Content-Encoding", "").lower()
+    if "gzip" in enc or "deflate" in enc:
+        print(f"[i] Panorama API responses are compressed ({enc}).")
+    else:
+        print("[i] Panorama isn't compressing API responses; continuing uncompressed.")
+
+def api_op(pan_ip, cmd):
     url = f"https://{pan_ip}/api/"
-    params = {"type": "config", "action": "set", "key": api_key, "xpath": xpath, "element": element_xml}
-    r = requests.post(url, params=params, verify=False, timeout=60)
+    params = {"type": "op", "cmd": cmd}
+    r = CLIENT.get(url, params=params, timeout=60)
     r.raise_for_status()
     return r.text
 
-def api_delete_config(pan_ip, api_key, xpath):
+def api_multi_config(pan_ip, element_xml):
+    # multi-config payloads can be large, so send them as a form body rather than in the URL.
     url = f"https://{pan_ip}/api/"
-    params = {"type": "config", "action": "delete", "key": api_key, "xpath": xpath}
-    r = requests.post(url, params=params, verify=False, timeout=60)
+    data = {"type": "config", "action": "multi-config", "element": element_xml}
+    r = CLIENT.post(url, data=data, timeout=120)
     r.raise_for_status()
     return r.text
 
 # --- XPaths for scopes --------------------------------------------------------
 
+# Both builders are called several times per row with a handful of distinct arguments,
+# so the formatted strings are memoized.
+
+@functools.lru_cache(maxsize=1024)
 def container_xpath_for_scope(scope: str, obj_type: str) -> str:
     """
     Returns the container (no entry) xpath where entries of this type live for the given scope.
@@ -111,22 +245,68 @@ def container_xpath_for_scope(scope: str, obj_type: str) -> str:
     return ("/config/devices/entry[@name='localhost.localdomain']"
             f"/device-group/entry[@name='{scope}']/{node}")
 
+@functools.lru_cache(maxsize=1024)
 def entry_xpath_for_scope(scope: str, obj_type: str, name: str) -> str:
     """Full xpath to the specific <entry name='...'> for the given scope."""
     return container_xpath_for_scope(scope, obj_type) + f"/entry[@name='{name}']"
 
 # --- Parsing helpers ----------------------------------------------------------
 
-def extract_entry_xml(api_xml: str) -> Optional[ET.Element]:
+def parse_api_response(api_xml: str):
+    """
+    Parse an API <response> and return its root element. Raises ET.ParseError on malformed XML
+    and ValueError when Panorama reports anything other than status="success".
+    """
+    root = ET.fromstring(api_xml.encode())
+    if root.get("status") != "success":
+        msg = " ".join(t.strip() for t in root.itertext() if t.strip())
+        raise ValueError(f"API returned status '{root.get('status')}': {msg or 'no message'}")
+    return root
+
+def extract_entries(api_xml: str) -> Dict[str, ET.Element]:
+    """
+    Given an API <response> XML string from 'get', return {name: <entry ...> element}
+    for every entry in the result. Raises on a malformed or error response.
+    """
+    root = parse_api_response(api_xml)
+    return {e.get("name"): e for e in root.findall("./result/entry")}
+
+def extract_container_names(api_xml: str) -> Set[str]:
+    """
+    Given an API <response> XML string from a container 'get'
+    (<result><address><entry .../>...</address></result>), return the entry names.
+    Raises on an error response, so a failed listing never passes for an empty container.
+    """
+    root = parse_api_response(api_xml)
+    return {e.get("name") for e in root.findall("./result/*/entry")}
+
+def parse_multi_config_response(api_xml: str, count: int) -> Tuple[bool, List[Tuple[Optional[bool], str]]]:
     """
-    Given an API <response> XML string from 'get', return the <entry ...> element (or None).
+    Parse a multi-config <response>. Returns (overall_ok, [(ok, message) for edit ids 1..count]),
+    where ok is True (applied), False (rejected by Panorama) or None (not rejected itself, but
+    not applied either because the request failed as a whole). The request is applied
+    all-or-nothing, so when the overall status isn't success no edit is reported as applied,
+    whatever its own id says; rolled-back edits carry the request-level error.
     """
     try:
-        root = ET.fromstring(api_xml)
+        root = ET.fromstring(api_xml.encode())
     except ET.ParseError:
-        return None
-    entry = root.find(".//entry")
-    return entry
+        return False, [(None, "Unparseable multi-config response")] * count
+    overall_ok = root.get("status") == "success"
+    results = {}
+    for resp in root.findall("./response"):
+        text = " ".join(t.strip() for t in resp.itertext() if t.strip())
+        results[resp.get("id")] = (resp.get("status") == "success", text or resp.get("status", ""))
+    if overall_ok:
+        return True, [results.get(str(i), (True, "ok")) for i in range(1, count + 1)]
+    top_msg = root.find("./msg")
+    top_text = " ".join(t.strip() for t in top_msg.itertext() if t.strip()) if top_msg is not None else ""
+    rolled_back = f"not applied (multi-config failed: {top_text})" if top_text else "not applied (multi-config failed)"
+    out = []
+    for i in range(1, count + 1):
+        ok, msg = results.get(str(i), (None, ""))
+        out.append((False, msg) if ok is False else (None, rolled_back))
+    return False, out
 
 def serialize_entry(elem: ET.Element) -> str:
     return ET.tostring(elem, encoding="unicode")
@@ -134,150 +314,448 @@ def serialize_entry(elem: ET.Element) -> str:
 def make_summary(obj_type: str, entry_elem: ET.Element) -> str:
     """
     Create a short human-friendly summary for logging (IP, members, ports, etc.).
+    The entry's direct children are indexed in a single pass instead of one findtext() walk per field.
     """
+    children = {child.tag: child for child in entry_elem}
+    texts = {tag: child.text for tag, child in children.items()}
     if obj_type == "address":
-        ip = entry_elem.findtext("./ip-netmask") or entry_elem.findtext("./ip-range") or entry_elem.findtext("./fqdn") or ""
-        desc = entry_elem.findtext("./description") or ""
+        ip = texts.get("ip-netmask") or texts.get("ip-range") or texts.get("fqdn") or ""
+        desc = texts.get("description") or ""
         return f"address: {ip} | {desc}".strip()
     if obj_type == "address-group":
-        dynamic = entry_elem.findtext("./dynamic/filter")
-        if dynamic:
-            return f"addr-group(dynamic): filter='{dynamic[:80]}'"
-        members = [m.text for m in entry_elem.findall("./static/member") if m.text]
+        dynamic = children.get("dynamic")
+        flt = dynamic.findtext("./filter") if dynamic is not None else None
+        if flt:
+            return f"addr-group(dynamic): filter='{flt[:80]}'"
+        static = children.get("static")
+        members = [m.text for m in static if m.tag == "member" and m.text] if static is not None else []
         return f"addr-group(static): members={len(members)}"
     if obj_type == "service":
-        proto = entry_elem.findtext("./protocol/tcp/port") or entry_elem.findtext("./protocol/udp/port") or ""
-        desc = entry_elem.findtext("./description") or ""
+        proto = ""
+        protocol = children.get("protocol")
+        for p in (protocol if protocol is not None else ()):
+            if p.tag in ("tcp", "udp"):
+                proto = p.findtext("./port") or ""
+                if proto:
+                    break
+        desc = texts.get("description") or ""
         return f"service: {proto} | {desc}".strip()
     if obj_type == "service-group":
-        members = [m.text for m in entry_elem.findall("./members/member") if m.text]
+        group = children.get("members")
+        members = [m.text for m in group if m.tag == "member" and m.text] if group is not None else []
         return f"service-group: members={len(members)}"
     return ""
 
 def detect_addr_group_reference_risk(obj_type: str, entry_elem: Optional[ET.Element]) -> bool:
-    if obj_type not in ("address-group", "service-group") or entry_elem is None:
+    if obj_type not in GROUP_TYPES or entry_elem is None:
         return False
     return True
 
-def object_exists_in_scope(pan_ip, api_key, scope: str, obj_type: str, name: str) -> bool:
-    dst_entry = entry_xpath_for_scope(scope, obj_type, name)
-    xml = api_get_config(pan_ip, api_key, dst_entry)
-    elem = extract_entry_xml(xml)
-    return elem is not None
-
-# --- Core move ----------------------------------------------------------------
-
-def move_one(pan_ip, api_key, obj_name, obj_type, src_scope, dst_scope, logger, collision_policy="skip"):
+def fetch_entries(pan_ip, scope: str, obj_type: str, names) -> Dict[str, ET.Element]:
+    """One 'get' for several entries of the same container; returns {name: <entry>} for those found."""
+    predicate = " or ".join(f"@name='{n}'" for n in names)
+    xpath = container_xpath_for_scope(scope, obj_type) + f"/entry[{predicate}]"
+    return extract_entries(api_get_config(pan_ip, xpath))
+
+def load_scope_index(pan_ip, scope: str, obj_type: str) -> Set[str]:
+    """Names of all entries in the (scope, obj_type) container; fetched once, then served from SCOPE_INDEX."""
+    key = (scope, obj_type)
+    with INDEX_LOCK:
+        if key in SCOPE_INDEX:
+            return SCOPE_INDEX[key]
+        fetch_lock = FETCH_LOCKS.setdefault(key, threading.Lock())
+    with fetch_lock:
+        with INDEX_LOCK:
+            if key in SCOPE_INDEX:  # another worker fetched it while we waited
+                return SCOPE_INDEX[key]
+            PENDING_DISCARDS[key] = set()
+        try:
+            names = extract_container_names(api_get_config(pan_ip, container_xpath_for_scope(scope, obj_type)))
+        except Exception:
+            with INDEX_LOCK:
+                PENDING_DISCARDS.pop(key, None)
+            raise
+        with INDEX_LOCK:
+            names -= PENDING_DISCARDS.pop(key)
+            SCOPE_INDEX[key] = names
+            # Pre-edit only if no multi-config had gone out by the time the listing returned.
+            if not EDITS_SENT.is_set():
+                PRISTINE_INDEX[key] = frozenset(names)
+            return names
+
+def index_discard(scope: str, obj_type: str, name: str):
+    """Drop a name from the (scope, obj_type) index, or park it if that listing is still being fetched."""
+    key = (scope, obj_type)
+    with INDEX_LOCK:
+        if key in SCOPE_INDEX:
+            SCOPE_INDEX[key].discard(name)
+        elif key in PENDING_DISCARDS:
+            PENDING_DISCARDS[key].add(name)
+
+def flush_batch(pan_ip, edits) -> Tuple[bool, List[Tuple[Optional[bool], str]]]:
     """
-    collision_policy: 'skip' or 'overwrite' (set+delete anyway). Default 'skip'.
+    Send a list of (action, xpath, element_xml) edits as one multi-config request.
+    element_xml is None for deletes. Returns (overall_ok, [(ok, message) per edit]).
     """
-    now = dt.datetime.now().isoformat(timespec="seconds")
-    obj_type = obj_type.strip().lower()
+    parts = []
+    for i, (action, xpath, element_xml) in enumerate(edits, 1):
+        if element_xml is None:
+            parts.append(f'<{action} id="{i}" xpath={quoteattr(xpath)}/>')
+        else:
+            parts.append(f'<{action} id="{i}" xpath={quoteattr(xpath)}>{element_xml}</{action}>')
+    # From here on, container listings may include this run's own uncommitted edits.
+    with INDEX_LOCK:
+        EDITS_SENT.set()
+    resp = api_multi_config(pan_ip, "<multi-config>" + "".join(parts) + "</multi-config>")
+    return parse_multi_config_response(resp, len(edits))
+
+# --- On-disk index cache -----------------------------------------------------
+
+def get_config_version(pan_ip) -> Optional[str]:
+    """Panorama's config version from 'show config version', or None if it can't be read."""
+    try:
+        root = ET.fromstring(api_op(pan_ip, "<show><config><version></version></config></show>").encode())
+    except Exception:
+        return None
+    result = root.find("./result")
+    if root.get("status") != "success" or result is None:
+        return None
+    return "".join(result.itertext()).strip() or None
 
-    if obj_type not in SUPPORTED_TYPES:
-        msg = f"Unsupported type '{obj_type}'. Supported: {', '.join(SUPPORTED_TYPES)}"
-        logger.writerow([now, obj_name, obj_type, src_scope, dst_scope, "error", msg, "", ""])
-        print(f"[!] {msg}")
-        return
+def has_pending_changes(pan_ip) -> Optional[bool]:
+    """Whether the candidate config has uncommitted changes, or None if it can't be read."""
+    try:
+        root = ET.fromstring(api_op(pan_ip, "<check><pending-changes></pending-changes></check>").encode())
+    except Exception:
+        return None
+    result = (root.findtext("./result") or "").strip().lower()
+    if root.get("status") != "success" or result not in ("yes", "no"):
+        return None
+    return result == "yes"
 
-    # 1) Read source entry
-    src_entry_xpath = entry_xpath_for_scope(src_scope, obj_type, obj_name)
+def index_cache_path(pan_ip, version: str) -> str:
+    safe = re.sub(r"[^A-Za-z0-9._-]", "_", f"{pan_ip}_{version}")
+    return os.path.join(INDEX_CACHE_DIR, f"index_{safe}.pkl")
+
+def load_index_cache(path: str) -> bool:
+    """Seed SCOPE_INDEX (and PRISTINE_INDEX) from a saved cache file. Returns True if one was loaded."""
     try:
-        src_xml = api_get_config(pan_ip, api_key, src_entry_xpath)
+        with open(path, "rb") as f:
+            cached = pickle.load(f)
+        for key, names in cached.items():
+            SCOPE_INDEX[key] = set(names)
+            PRISTINE_INDEX[key] = frozenset(names)
+        return True
+    except FileNotFoundError:
+        return False
     except Exception as e:
-        msg = f"API get failed from src: {e}"
-        logger.writerow([now, obj_name, obj_type, src_scope, dst_scope, "error", msg, "", ""])
-        print(f"[!] {msg}")
-        return
+        print(f"[!] Ignoring unreadable index cache {path}: {e}")
+        return False
 
-    entry_elem = extract_entry_xml(src_xml)
-    if entry_elem is None:
-        msg = f"Object not found in source scope '{src_scope}'."
-        logger.writerow([now, obj_name, obj_type, src_scope, dst_scope, "error", msg, "", src_xml])
-        print(f"[!] {msg}")
-        return
+def save_index_cache(path: str, pan_ip):
+    """
+    Write PRISTINE_INDEX to path and drop caches saved for older versions of this Panorama.
+    SCOPE_INDEX isn't saved: it holds this run's uncommitted edits, which the committed config
+    version used as the cache key doesn't reflect.
+    """
+    os.makedirs(INDEX_CACHE_DIR, exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        pickle.dump({key: set(names) for key, names in PRISTINE_INDEX.items()}, f)
+    os.replace(tmp, path)
+    safe_ip = re.sub(r"[^A-Za-z0-9._-]", "_", str(pan_ip))
+    for old in glob.glob(os.path.join(INDEX_CACHE_DIR, f"index_{safe_ip}_*.pkl")):
+        if old != path:
+            os.remove(old)
 
-    # 2) Collision check at destination
-    if object_exists_in_scope(pan_ip, api_key, dst_scope, obj_type, obj_name):
-        if collision_policy == "skip":
-            msg = "Destination already has object with same name. Skipping."
-            summary = make_summary(obj_type, entry_elem)
-            logger.writerow([now, obj_name, obj_type, src_scope, dst_scope, "skipped", msg, summary, serialize_entry(entry_elem)])
-            print(f"[-] {msg} ({obj_name})")
-            return
-        elif collision_policy == "overwrite":
-            # delete destination then continue
-            dst_entry_xpath = entry_xpath_for_scope(dst_scope, obj_type, obj_name)
-            try:
-                api_delete_config(pan_ip, api_key, dst_entry_xpath)
-                print(f"[i] Deleted existing '{obj_name}' in dst to overwrite.")
-            except Exception as e:
-                msg = f"Failed to delete existing dst object before overwrite: {e}"
-                summary = make_summary(obj_type, entry_elem)
-                logger.writerow([now, obj_name, obj_type, src_scope, dst_scope, "error", msg, summary, serialize_entry(entry_elem)])
-                print(f"[!] {msg}")
-                return
-
-    # 3) Add to destination (set at container xpath with full <entry>)
-    dst_container_xpath = container_xpath_for_scope(dst_scope, obj_type)
-    entry_xml_str = serialize_entry(entry_elem)
-
-    # Advisory note for groups
-    if detect_addr_group_reference_risk(obj_type, entry_elem):
-        print(f"[!] Warning: moving group '{obj_name}' may break member references if they don’t exist in '{dst_scope}'.")
+# --- Core move ----------------------------------------------------------------
 
+def log_row(log_q, row, status, message, summary="", xml=""):
+    # The timestamp column is added by drain_log_queue(). The XML is base64-encoded so the
+    # column never needs CSV quoting (entry XML is full of double quotes).
+    xml_b64 = base64.b64encode(xml.encode("utf-8")).decode("ascii") if xml else ""
+    log_q.put([row.row, row.object_name, row.object_type, row.src_scope, row.dst_scope,
+               status, message, summary, xml_b64])
+
+def group_by_container(rows, scope_key: str) -> Dict[Tuple[str, str], list]:
+    """Group rows by (scope, object_type), where scope is the row's scope_key field."""
+    groups = {}
+    for row in rows:
+        groups.setdefault((getattr(row, scope_key), row.object_type), []).append(row)
+    return groups
+
+def plan_edits(row, entry_xml_str: str, overwrite: bool) -> list:
+    """Edits that move one row: [delete existing dst entry (overwrite only)], set at dst, delete at src."""
+    obj_name, obj_type = row.object_name, row.object_type
+    edits = []
+    if overwrite:
+        edits.append(("delete", entry_xpath_for_scope(row.dst_scope, obj_type, obj_name), None))
+    edits.append(("set", container_xpath_for_scope(row.dst_scope, obj_type), entry_xml_str))
+    edits.append(("delete", entry_xpath_for_scope(row.src_scope, obj_type, obj_name), None))
+    return edits
+
+def apply_edits(pan_ip, row_edits: list) -> list:
+    """
+    Send every row's edits in one multi-config request and return the per-edit results grouped
+    per row. PAN-OS applies a multi-config request all-or-nothing, so if the combined request
+    fails each row is retried on its own; one bad object doesn't hold back the rest of the batch.
+    """
+    edits = [e for row in row_edits for e in row]
     try:
-        api_set_config(pan_ip, api_key, dst_container_xpath, entry_xml_str)
-        print(f"[+] Added '{obj_name}' to '{dst_scope}'.")
+        ok, results = flush_batch(pan_ip, edits)
     except Exception as e:
-        msg = f"Failed to add to destination: {e}"
+        ok, results = False, [(None, f"multi-config request failed: {e}")] * len(edits)
+    if not ok and len(row_edits) > 1:
+        return [apply_edits(pan_ip, [row])[0] for row in row_edits]
+    grouped, pos = [], 0
+    for row in row_edits:
+        grouped.append(results[pos:pos + len(row)])
+        pos += len(row)
+    return grouped
+
+def move_batch(pan_ip, rows, log_q, collision_policy="skip"):
+    """
+    Move a batch of CSV rows using one bulk 'get' per source container and a single
+    multi-config request for all of the resulting set/delete edits. Log rows go to log_q.
+    collision_policy: 'skip' or 'overwrite' (set+delete anyway). Default 'skip'.
+    """
+    valid = []
+    for row in rows:
+        if row.object_type not in SUPPORTED_TYPES:
+            msg = f"Unsupported type '{row.object_type}'. Supported: {', '.join(SUPPORTED_TYPES)}"
+            log_row(log_q, row, "error", msg)
+            print(f"[!] {msg}")
+        else:
+            valid.append(row)
+
+    # 1) Read source entries, one 'get' per source container
+    found = []
+    for (src_scope, obj_type), group in group_by_container(valid, "src_scope").items():
+        try:
+            names = sorted({r.object_name for r in group})
+            src_entries = fetch_entries(pan_ip, src_scope, obj_type, names)
+        except Exception as e:
+            msg = f"API get failed from src: {e}"
+            for row in group:
+                log_row(log_q, row, "error", msg)
+            print(f"[!] {msg}")
+            continue
+        for row in group:
+            entry_elem = src_entries.get(row.object_name)
+            if entry_elem is None:
+                msg = (f"Object not found in source scope '{src_scope}' "
+                       f"(bulk get returned {len(src_entries)} of {len(names)} requested).")
+                log_row(log_q, row, "error", msg)
+                print(f"[!] {msg} ({row.object_name})")
+            else:
+                found.append((row, entry_elem))
+
+    # 2) Collision check at destination against the cached container index
+    planned = []
+    for row, entry_elem in found:
+        obj_name, obj_type, dst_scope = row.object_name, row.object_type, row.dst_scope
+        # Serialize and summarize once; every log path below reuses these.
+        entry_xml_str = serialize_entry(entry_elem)
         summary = make_summary(obj_type, entry_elem)
-        logger.writerow([now, obj_name, obj_type, src_scope, dst_scope, "error", msg, summary, entry_xml_str])
-        print(f"[!] {msg}")
+        try:
+            existing = load_scope_index(pan_ip, dst_scope, obj_type)
+        except Exception as e:
+            msg = f"API get failed from dst: {e}"
+            log_row(log_q, row, "error", msg, summary, entry_xml_str)
+            print(f"[!] {msg}")
+            continue
+
+        with INDEX_LOCK:
+            collision = obj_name in existing
+            # Later rows (in this batch or a concurrent one) must see the name as taken.
+            existing.add(obj_name)
+
+        overwrite = False
+        if collision:
+            if collision_policy == "skip":
+                msg = "Destination already has object with same name. Skipping."
+                log_row(log_q, row, "skipped", msg, summary, entry_xml_str)
+                print(f"[-] {msg} ({obj_name})")
+                continue
+            overwrite = collision_policy == "overwrite"
+
+        # Advisory note for groups
+        if detect_addr_group_reference_risk(obj_type, entry_elem):
+            print(f"[!] Warning: moving group '{obj_name}' may break member references if they don’t exist in '{dst_scope}'.")
+
+        planned.append((row, summary, entry_xml_str, plan_edits(row, entry_xml_str, overwrite)))
+
+    if not planned:
         return
 
-    # 4) Delete from source
-    try:
-        api_delete_config(pan_ip, api_key, src_entry_xpath)
-        print(f"[+] Removed '{obj_name}' from '{src_scope}'.")
-        status = "moved"
-        message = "ok"
-    except Exception as e:
-        # If delete fails, we’ve effectively copied not moved. Log as 'copied'.
-        status = "copied"
-        message = f"Added to dst but failed to delete from src: {e}"
-        print(f"[!] {message}")
+    # 3) One multi-config request for every set/delete in the batch
+    results = apply_edits(pan_ip, [edits for _, _, _, edits in planned])
+    for (row, summary, entry_xml_str, _), row_results in zip(planned, results):
+        obj_name, obj_type = row.object_name, row.object_type
+        # Edits are [delete existing dst entry (overwrite only)], set at dst, delete at src.
+        overwrite = len(row_results) == 3
+        set_ok = row_results[-2][0]
+        del_ok, del_msg = row_results[-1]
+        if all(ok for ok, _ in row_results):
+            status = "moved"
+            message = "ok"
+            print(f"[+] Moved '{obj_name}' from '{row.src_scope}' to '{row.dst_scope}'.")
+            index_discard(row.src_scope, obj_type, obj_name)
+        elif set_ok and del_ok is False and (not overwrite or row_results[0][0]):
+            # If delete fails, we’ve effectively copied not moved. Log as 'copied'.
+            status = "copied"
+            message = f"Added to dst but failed to delete from src: {del_msg}"
+            print(f"[!] {message}")
+        else:
+            # Report the edit Panorama actually rejected; edits that were only rolled back
+            # (ok is None) carry the request-level error.
+            labels = ["Failed to delete existing dst object before overwrite"] if overwrite else []
+            labels += ["Failed to add to destination", "Failed to delete from source"]
+            rejected = [(label, msg) for label, (ok, msg) in zip(labels, row_results) if ok is False]
+            label, msg = rejected[0] if rejected else (labels[-2], row_results[-2][1])
+            status = "error"
+            message = f"{label}: {msg}"
+            print(f"[!] {message}")
+            if not overwrite and not set_ok:
+                # release the name reserved during planning
+                with INDEX_LOCK:
+                    SCOPE_INDEX[(row.dst_scope, obj_type)].discard(obj_name)
+        log_row(log_q, row, status, message, summary, entry_xml_str)
+
+def group_dependent_rows(rows) -> list:
+    """
+    Split rows into groups that are safe to move concurrently. Rows that share an object_name
+    or a (src_scope, dst_scope, object_type) key end up in the same group (connected
+    components), so chained moves such as X A->B then X B->C never race. Each group keeps
+    the order of rows.
+    """
+    parent = list(range(len(rows)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
 
-    # 5) Log
-    summary = make_summary(obj_type, entry_elem)
-    logger.writerow([now, obj_name, obj_type, src_scope, dst_scope, status, message, summary, entry_xml_str])
+    first_seen = {}
+    for i, row in enumerate(rows):
+        for key in (("name", row.object_name), ("pair", row.src_scope, row.dst_scope, row.object_type)):
+            parent[find(i)] = find(first_seen.setdefault(key, i))
+
+    groups = {}
+    for i, row in enumerate(rows):
+        groups.setdefault(find(i), []).append(row)
+    return list(groups.values())
+
+def move_group(pan_ip, rows, log_q, collision_policy, batch_size):
+    """
+    Move one group of dependent rows, batch by batch and in order. A batch is cut early when
+    an object name repeats, so a later move of the same object reads the result of the earlier one.
+    """
+    batch, names = [], set()
+    for row in rows:
+        if len(batch) >= batch_size or row.object_name in names:
+            move_batch(pan_ip, batch, log_q, collision_policy=collision_policy)
+            batch, names = [], set()
+        batch.append(row)
+        names.add(row.object_name)
+    if batch:
+        move_batch(pan_ip, batch, log_q, collision_policy=collision_policy)
 
 def main():
     cfg = read_config("panw.cfg")
     pan_ip = cfg["panorama_ip"]
-    api_key = cfg["api_key"]
+    CLIENT.params = {"key": cfg["api_key"]}
 
-    # Optional behavior tweak via env var:
+    # Optional behavior tweaks via env vars:
     collision_policy = os.getenv("MOVE_COLLISION", "skip").lower().strip()  # 'skip' or 'overwrite'
-
-    log_f, log_w, log_name = open_logger()
+    batch_size = max(1, int(os.getenv("MOVE_BATCH_SIZE", "50")))  # rows per multi-config request
+    concurrency = max(1, int(os.getenv("MOVE_CONCURRENCY", "8")))  # groups moved in parallel
+    log_bufsize = max(1, int(os.getenv("MOVE_LOG_BUFSIZE", str(1 << 20))))  # log write buffer, bytes
+    use_index_cache = os.getenv("MOVE_INDEX_CACHE", "0").strip().lower() in ("1", "yes", "true")
+
+    # Reuse container indexes from a previous run against the same config version. The key is
+    # the committed version, so the cache is only valid when the candidate config has no
+    # pending changes; otherwise it is neither loaded nor saved.
+    index_cache = None
+    if use_index_cache:
+        pending = has_pending_changes(pan_ip)
+        version = get_config_version(pan_ip) if pending is False else None
+        if pending:
+            print("[!] Candidate config has pending changes; index cache disabled for this run.")
+        elif pending is None:
+            print("[!] Could not check for pending changes; index cache disabled for this run.")
+        elif version is None:
+            print("[!] Could not read Panorama config version; index cache disabled for this run.")
+        else:
+            index_cache = index_cache_path(pan_ip, version)
+            if load_index_cache(index_cache):
+                print(f"[i] Loaded container index cache for config version {version}.")
+
+    log_f, log_w, log_name = open_logger(log_bufsize)
     print(f"[i] Logging to {log_name}")
 
     # Expected CSV header: object_name,object_type,src_scope,dst_scope
     input_csv = sys.argv[1] if len(sys.argv) > 1 else "objects.csv"
-    count = 0
+    rows = []
     with open(input_csv, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            obj_name = row["object_name"].strip()
-            obj_type = row["object_type"].strip()
-            src_scope = row["src_scope"].strip()
-            dst_scope = row["dst_scope"].strip()
-            move_one(pan_ip, api_key, obj_name, obj_type, src_scope, dst_scope, log_w, collision_policy=collision_policy)
-            count += 1
-
-    log_f.close()
-    print(f"[i] Processed {count} row(s).")
+        # Plain csv.reader: the header is resolved to column positions once, so no dict per row.
+        reader = csv.reader(f)
+        header = next(reader, [])
+        missing = [c for c in CSV_COLUMNS if c not in header]
+        if missing:
+            raise ValueError(f"Missing column(s) {', '.join(missing)} in {input_csv}")
+        i_name, i_type, i_src, i_dst = (header.index(c) for c in CSV_COLUMNS)
+        # Blank lines are skipped without being counted, as csv.DictReader did, so 'row'
+        # stays the 1-based data row number.
+        n = 0
+        for rec in reader:
+            if not rec:
+                continue
+            n += 1
+            rows.append(Row(n, rec[i_name].strip(), rec[i_type].strip().lower(),
+                            rec[i_src].strip(), rec[i_dst].strip()))
+
+    # Independent groups (see group_dependent_rows) run concurrently. Within a group, rows are
+    # sorted so container fetches and batches are homogeneous. The sort is skipped when an
+    # object name repeats, because those rows are chained moves and must keep CSV order.
+    groups = group_dependent_rows([r for r in rows if r.object_type not in GROUP_TYPES])
+    for group in groups:
+        if len({r.object_name for r in group}) == len(group):
+            group.sort(key=lambda r: (r.src_scope, r.dst_scope, r.object_type))
+    # Address/service-group rows reference other objects, so they run as a second phase once
+    # every plain object has moved, as one sequential group in CSV order (groups may nest).
+    group_rows = [r for r in rows if r.object_type in GROUP_TYPES]
+    phases = [groups, [group_rows] if group_rows else []]
+
+    # With the cache on, list every destination container before any edit is sent so the
+    # listings are pre-edit and can be saved. A failed fetch is retried (and reported) per row.
+    if index_cache:
+        for key in sorted({(r.dst_scope, r.object_type) for r in rows if r.object_type in SUPPORTED_TYPES}):
+            try:
+                load_scope_index(pan_ip, *key)
+            except Exception:
+                pass
+
+    # Workers only queue log rows; a single writer thread owns the CSV file.
+    log_q = queue.Queue()
+    writer = threading.Thread(target=drain_log_queue, args=(log_q, log_w, log_f))
+    writer.start()
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for phase in phases:
+                futures = [pool.submit(move_group, pan_ip, group, log_q, collision_policy, batch_size)
+                           for group in phase]
+                for fut in as_completed(futures):
+                    fut.result()
+        if index_cache:
+            save_index_cache(index_cache, pan_ip)
+    finally:
+        log_q.put(None)
+        writer.join()
+        log_f.close()
+        CLIENT.close()
+    print(f"[i] Processed {len(rows)} row(s).")
     print("[i] NOTE: This script does not commit changes. Commit in Panorama when ready.")
 
 if __name__ == "__main__":